@@ -15,7 +15,13 @@ def check_contains(cli_result: Result, content: str, should_contain: bool):
         should_contain: if True, checks that content is in cli_result,
             if False, checks that content is not in cli_result
     """
-    output = cli_result.stdout.strip()
+    _check_output_contains(cli_result.stdout.strip(), content, should_contain)
+
+
+def _check_output_contains(output: str, content: str, should_contain: bool):
+    """
+    Check that content is or is not in already decoded and stripped CLI output.
+    """
     content = textwrap.dedent(content).strip()
 
     if should_contain:
@@ -79,17 +85,21 @@ def invoke_and_assert(
     with ctx:
         result = runner.invoke(app, command, catch_exceptions=False, input=user_input)
 
+    # Decode the output once rather than on every access of `result.stdout`
+    stdout = result.stdout
+
     if echo:
         print("------ CLI output ------")
-        print(result.stdout)
+        print(stdout)
 
     if expected_code is not None:
         assert (
             result.exit_code == expected_code
         ), f"Actual exit code: {result.exit_code!r}"
 
+    output = stdout.strip()
+
     if expected_output is not None:
-        output = result.stdout.strip()
         expected_output = textwrap.dedent(expected_output).strip()
 
         print("------ expected ------")
@@ -100,18 +110,20 @@ def invoke_and_assert(
 
     if expected_output_contains is not None:
         if isinstance(expected_output_contains, str):
-            check_contains(result, expected_output_contains, should_contain=True)
+            _check_output_contains(
+                output, expected_output_contains, should_contain=True
+            )
         else:
             for contents in expected_output_contains:
-                check_contains(result, contents, should_contain=True)
+                _check_output_contains(output, contents, should_contain=True)
 
     if expected_output_does_not_contain is not None:
         if isinstance(expected_output_does_not_contain, str):
-            check_contains(
-                result, expected_output_does_not_contain, should_contain=False
+            _check_output_contains(
+                output, expected_output_does_not_contain, should_contain=False
             )
         else:
             for contents in expected_output_does_not_contain:
-                check_contains(result, contents, should_contain=False)
+                _check_output_contains(output, contents, should_contain=False)
 
     return result
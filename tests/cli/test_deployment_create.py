@@ -6,78 +6,73 @@ from prefect.testing.cli import invoke_and_assert
 
 EXAMPLES = Path(__file__).parent.parent / "deployments" / "examples"
 
-pytestmark = pytest.mark.skip(reason="Will revisit later as tech debt.")
-
-
-@pytest.mark.parametrize(
-    "path",
-    [
-        EXAMPLES / "single_deployment_with_flow.py",
-        EXAMPLES / "single_deployment_with_flow_script.py",
-    ],
+pytest.skip(
+    "Will revisit later as tech debt: `prefect deployment create` was removed and "
+    f"the examples in {str(EXAMPLES)!r} no longer exist.",
+    allow_module_level=True,
 )
-def test_create_deployment_from_script(path: Path):
-    invoke_and_assert(
-        ["deployment", "create", str(path)],
-        expected_output_contains=[
-            "deployments from python script",
-            "Created 1 deployment:",
-        ],
-    )
-
-
-def test_create_deployment_from_script_with_invalid_deployment():
-    path = EXAMPLES / "invalid_deployment.py"
-    invoke_and_assert(
-        ["deployment", "create", str(path)],
-        expected_output_contains=[
-            "deployments from python script",
-            "1 invalid deployment",
-        ],
-        expected_code=1,
-    )
-
-
-@pytest.mark.parametrize(
-    "path",
-    [
-        EXAMPLES / "multiple_invalid_deployments.py",
-        EXAMPLES / "multiple_invalid_deployments.yaml",
-    ],
-)
-def test_create_deployment_with_multiple_invalid_deployments(path):
-    invoke_and_assert(
-        ["deployment", "create", str(path)],
-        expected_output_contains="2 invalid deployments",
-        expected_code=1,
-    )
-
-
-@pytest.mark.parametrize(
-    "path",
-    [
-        EXAMPLES / "mixed_valid_invalid_deployments.py",
-        EXAMPLES / "mixed_valid_invalid_deployments.yaml",
-    ],
-)
-def test_create_deployment_with_mixed_valid_invalid_deployments(path):
-    invoke_and_assert(
-        ["deployment", "create", str(path)],
-        expected_output_contains="1 invalid deployment",
-        expected_code=1,
-    )
 
 
 @pytest.mark.parametrize(
-    "path",
-    [EXAMPLES / "single_deployment.yaml"],
+    "fname,expected_output_contains,expected_code",
+    (
+        pytest.param(
+            "single_deployment_with_flow.py",
+            ("deployments from python script", "Created 1 deployment:"),
+            0,
+            id="script-flow",
+        ),
+        pytest.param(
+            "single_deployment_with_flow_script.py",
+            ("deployments from python script", "Created 1 deployment:"),
+            0,
+            id="script-flow-script",
+        ),
+        pytest.param(
+            "invalid_deployment.py",
+            ("deployments from python script", "1 invalid deployment"),
+            1,
+            id="script-invalid",
+        ),
+        pytest.param(
+            "multiple_invalid_deployments.py",
+            ("2 invalid deployments",),
+            1,
+            id="script-multiple-invalid",
+        ),
+        pytest.param(
+            "multiple_invalid_deployments.yaml",
+            ("2 invalid deployments",),
+            1,
+            id="yaml-multiple-invalid",
+        ),
+        pytest.param(
+            "mixed_valid_invalid_deployments.py",
+            ("1 invalid deployment",),
+            1,
+            id="script-mixed-valid-invalid",
+        ),
+        pytest.param(
+            "mixed_valid_invalid_deployments.yaml",
+            ("1 invalid deployment",),
+            1,
+            id="yaml-mixed-valid-invalid",
+        ),
+        pytest.param(
+            "single_deployment.yaml",
+            (
+                "deployments from yaml file",
+                "flow from script",
+                "Created 1 deployment:",
+            ),
+            0,
+            id="yaml",
+        ),
+    ),
 )
-def test_create_deployment_from_yaml(path: Path):
+def test_create_deployment(fname, expected_output_contains, expected_code):
     invoke_and_assert(
-        ["deployment", "create", str(path)],
-        expected_output_contains=[
-            "deployments from yaml file",
-            "flow from script",
-            "Created 1 deployment:",
-        ],
+        ["deployment", "create", str(EXAMPLES / fname)],
+        expected_output_contains=expected_output_contains,
+        expected_code=expected_code,
     )
@@ -62,6 +62,12 @@ from .fixtures.docker import *
 from .fixtures.logging import *
 from .fixtures.storage import *
 
+# Test modules that are not collected at all; tech debt to be revisited later.
+# `test_deployment_create.py` covers `prefect deployment create`, which has been
+# removed, and its example files are gone. Ignoring it here avoids building (and
+# then skipping) its parametrized items.
+collect_ignore = ["cli/test_deployment_create.py"]
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -1,6 +1,6 @@
+import threading
 import time
 from contextlib import contextmanager
-from functools import partial
 from unittest.mock import MagicMock
 
 import anyio
@@ -33,22 +33,34 @@ from prefect.utilities.collections import quote
 from prefect.utilities.pydantic import PartialModel
 
 
+class ShiftedNow:
+    """
+    Replacement for `pendulum.now` that returns the current time shifted forward by
+    a mutable number of seconds.
+    """
+
+    __slots__ = ("original_now", "shift")
+
+    def __init__(self, original_now):
+        self.original_now = original_now
+        self.shift = 0
+
+    def __call__(self, *args):
+        return self.original_now(*args).add(seconds=self.shift)
+
+
 @pytest.fixture
 def mock_client_sleep(monkeypatch):
     """
     Mock sleep used by the orion_client to not actually sleep but to set the
     current time to now + sleep delay seconds.
     """
-    original_now = pendulum.now
-    time_shift = 0
+    now = ShiftedNow(pendulum.now)
 
     async def callback(delay_in_seconds):
-        nonlocal time_shift
-        time_shift += delay_in_seconds
+        now.shift += delay_in_seconds
 
-    monkeypatch.setattr(
-        "pendulum.now", lambda *args: original_now(*args).add(seconds=time_shift)
-    )
+    monkeypatch.setattr("pendulum.now", now)
 
     sleep = AsyncMock(side_effect=callback)
     monkeypatch.setattr("prefect.client.sleep", sleep)
@@ -56,6 +68,24 @@ def mock_client_sleep(monkeypatch):
     return sleep
 
 
+# Flows and tasks that do not vary between tests are defined once at module scope
+
+
+@task
+def returns_one_task():
+    return 1
+
+
+@flow
+def returns_one_flow():
+    return 1
+
+
+@flow
+def returns_x_flow(x: int):
+    return x
+
+
 class TestOrchestrateTaskRun:
     async def test_waits_until_scheduled_start_time(
         self,
@@ -65,12 +95,8 @@ class TestOrchestrateTaskRun:
         local_filesystem,
         monkeypatch,
     ):
-        @task
-        def foo():
-            return 1
-
         task_run = await orion_client.create_task_run(
-            task=foo,
+            task=returns_one_task,
             flow_run_id=flow_run.id,
             dynamic_key="0",
             state=State(
@@ -82,7 +108,7 @@ class TestOrchestrateTaskRun:
         )
 
         state = await orchestrate_task_run(
-            task=foo,
+            task=returns_one_task,
             task_run=task_run,
             parameters={},
             wait_for=None,
@@ -98,12 +124,8 @@ class TestOrchestrateTaskRun:
     async def test_does_not_wait_for_scheduled_time_in_past(
         self, orion_client, flow_run, mock_client_sleep, local_filesystem
     ):
-        @task
-        def foo():
-            return 1
-
         task_run = await orion_client.create_task_run(
-            task=foo,
+            task=returns_one_task,
             flow_run_id=flow_run.id,
             dynamic_key="0",
             state=State(
@@ -115,7 +137,7 @@ class TestOrchestrateTaskRun:
         )
 
         state = await orchestrate_task_run(
-            task=foo,
+            task=returns_one_task,
             task_run=task_run,
             parameters={},
             wait_for=None,
@@ -132,16 +154,17 @@ class TestOrchestrateTaskRun:
         self, mock_client_sleep, orion_client, flow_run, local_filesystem
     ):
         # Define a task that fails once and then succeeds
-        mock = MagicMock()
+        task_run_count = 0
 
-        @task(retries=1, retry_delay_seconds=43)
+        @task(retries=1, retry_delay_seconds=3)
         def flaky_function():
-            mock()
+            nonlocal task_run_count
+            task_run_count += 1
 
-            if mock.call_count == 2:
-                return 1
+            if task_run_count == 1:
+                raise ValueError("try again, but only once")
 
-            raise ValueError("try again, but only once")
+            return 1
 
         # Create a task run to test
         task_run = await orion_client.create_task_run(
@@ -166,10 +189,10 @@ class TestOrchestrateTaskRun:
         assert state.result() == 1
 
         # Assert that the sleep was called
-        # due to network time and rounding, the expected sleep time will be less than
-        # 43 seconds so we test a window
+        # the delay is reported in whole seconds and, due to network time, the expected
+        # sleep time will be less than 3 seconds so we test a window
         mock_client_sleep.assert_awaited_once()
-        assert 40 < mock_client_sleep.call_args[0][0] < 43
+        assert 0 < mock_client_sleep.call_args[0][0] < 3
 
         # Check expected state transitions
         states = await orion_client.read_task_run_states(task_run.id)
@@ -182,11 +205,8 @@ class TestOrchestrateTaskRun:
             StateType.COMPLETED,
         ]
 
-    @pytest.mark.parametrize(
-        "upstream_task_state", [Pending(), Running(), Cancelled(), Failed()]
-    )
     async def test_returns_not_ready_when_any_upstream_futures_resolve_to_incomplete(
-        self, orion_client, flow_run, upstream_task_state, local_filesystem
+        self, orion_client, flow_run, local_filesystem
     ):
         # Define a mock to ensure the task was not run
         mock = MagicMock()
@@ -195,54 +215,55 @@ class TestOrchestrateTaskRun:
         def my_task(x):
             mock()
 
-        # Create an upstream task run
-        upstream_task_run = await orion_client.create_task_run(
-            task=my_task,
-            flow_run_id=flow_run.id,
-            state=upstream_task_state,
-            dynamic_key="upstream",
-        )
-        upstream_task_state.state_details.task_run_id = upstream_task_run.id
-
-        # Create a future to wrap the upstream task, have it resolve to the given
-        # incomplete state
-        future = PrefectFuture(
-            task_run=upstream_task_run,
-            run_key=str(upstream_task_run.id),
-            task_runner=None,
-            _final_state=upstream_task_state,
-        )
+        for upstream_task_state in [Pending(), Running(), Cancelled(), Failed()]:
+            # Create an upstream task run
+            upstream_task_run = await orion_client.create_task_run(
+                task=my_task,
+                flow_run_id=flow_run.id,
+                state=upstream_task_state,
+                dynamic_key=f"upstream-{upstream_task_state.type.value}",
+            )
+            upstream_task_state.state_details.task_run_id = upstream_task_run.id
+
+            # Create a future to wrap the upstream task, have it resolve to the given
+            # incomplete state
+            future = PrefectFuture(
+                task_run=upstream_task_run,
+                run_key=str(upstream_task_run.id),
+                task_runner=None,
+                _final_state=upstream_task_state,
+            )
 
-        # Create a task run to test
-        task_run = await orion_client.create_task_run(
-            task=my_task,
-            flow_run_id=flow_run.id,
-            state=Pending(),
-            dynamic_key="downstream",
-        )
+            # Create a task run to test
+            task_run = await orion_client.create_task_run(
+                task=my_task,
+                flow_run_id=flow_run.id,
+                state=Pending(),
+                dynamic_key=f"downstream-{upstream_task_state.type.value}",
+            )
 
-        # Actually run the task
-        state = await orchestrate_task_run(
-            task=my_task,
-            task_run=task_run,
-            # Nest the future in a collection to ensure that it is found
-            parameters={"x": {"nested": [future]}},
-            wait_for=None,
-            result_filesystem=local_filesystem,
-            interruptible=False,
-            client=orion_client,
-        )
+            # Actually run the task
+            state = await orchestrate_task_run(
+                task=my_task,
+                task_run=task_run,
+                # Nest the future in a collection to ensure that it is found
+                parameters={"x": {"nested": [future]}},
+                wait_for=None,
+                result_filesystem=local_filesystem,
+                interruptible=False,
+                client=orion_client,
+            )
 
-        # The task did not run
-        mock.assert_not_called()
+            # Check that the state is 'NotReady'
+            assert state.is_pending()
+            assert state.name == "NotReady"
+            assert (
+                state.message
+                == f"Upstream task run '{upstream_task_run.id}' did not reach a 'COMPLETED' state."
+            )
 
-        # Check that the state is 'NotReady'
-        assert state.is_pending()
-        assert state.name == "NotReady"
-        assert (
-            state.message
-            == f"Upstream task run '{upstream_task_run.id}' did not reach a 'COMPLETED' state."
-        )
+        # The task did not run for any of the upstream states
+        mock.assert_not_called()
 
     async def test_quoted_parameters_are_resolved(
         self, orion_client, flow_run, local_filesystem
@@ -319,14 +340,17 @@ class TestOrchestrateTaskRun:
         assert state.is_completed()
 
     @flaky_on_windows
+    @pytest.mark.slow
     async def test_interrupt_task(self):
-        i = 0
+        ticked = threading.Event()
 
         @task()
         def just_sleep():
-            nonlocal i
-            for i in range(100):  # Sleep for 10 seconds
-                time.sleep(0.1)
+            # Sleep for 10 seconds in short increments; the interrupt can only be
+            # raised in the worker thread between calls to `sleep`
+            for _ in range(1000):
+                ticked.set()
+                time.sleep(0.01)
 
         @flow
         def my_flow():
@@ -341,14 +365,15 @@ class TestOrchestrateTaskRun:
         runtime = t1 - t0
         assert runtime < 2, "The call should be return quickly after timeout"
 
-        # Sleep for an extra second to check if the thread is still running. We cannot
-        # check `thread.is_alive()` because it is still alive — presumably this is because
-        # AnyIO is using long-lived worker threads instead of creating a new thread per
-        # task. Without a check like this, the thread can be running after timeout in the
-        # background and we will not know — the next test will start.
-        await anyio.sleep(1)
-
-        assert i <= 10, "`just_sleep` should not be running after timeout"
+        # Check that the thread is no longer running by waiting for well over one loop
+        # iteration without a tick. We cannot check `thread.is_alive()` because it is
+        # still alive — presumably this is because AnyIO is using long-lived worker
+        # threads instead of creating a new thread per task. Without a check like this,
+        # the thread can be running after timeout in the background and we will not
+        # know — the next test will start.
+        ticked.clear()
+        ticked_again = await anyio.to_thread.run_sync(ticked.wait, 0.2)
+        assert not ticked_again, "`just_sleep` should not be running after timeout"
 
 
 class TestOrchestrateFlowRun:
@@ -364,12 +389,8 @@ class TestOrchestrateFlowRun:
     async def test_waits_until_scheduled_start_time(
         self, orion_client, mock_client_sleep, partial_flow_run_context
     ):
-        @flow
-        def foo():
-            return 1
-
         flow_run = await orion_client.create_flow_run(
-            flow=foo,
+            flow=returns_one_flow,
             state=State(
                 type=StateType.SCHEDULED,
                 state_details=StateDetails(
@@ -379,7 +400,7 @@ class TestOrchestrateFlowRun:
         )
 
         state = await orchestrate_flow_run(
-            flow=foo,
+            flow=returns_one_flow,
             flow_run=flow_run,
             parameters={},
             client=orion_client,
@@ -393,12 +414,8 @@ class TestOrchestrateFlowRun:
     async def test_does_not_wait_for_scheduled_time_in_past(
         self, orion_client, mock_client_sleep, partial_flow_run_context
     ):
-        @flow
-        def foo():
-            return 1
-
         flow_run = await orion_client.create_flow_run(
-            flow=foo,
+            flow=returns_one_flow,
             state=State(
                 type=StateType.SCHEDULED,
                 state_details=StateDetails(
@@ -409,7 +426,7 @@ class TestOrchestrateFlowRun:
 
         with anyio.fail_after(5):
             state = await orchestrate_flow_run(
-                flow=foo,
+                flow=returns_one_flow,
                 flow_run=flow_run,
                 parameters={},
                 client=orion_client,
@@ -425,7 +442,7 @@ class TestOrchestrateFlowRun:
     ):
         flow_run_count = 0
 
-        @flow(retries=1, retry_delay_seconds=43)
+        @flow(retries=1, retry_delay_seconds=3)
         def flaky_function():
             nonlocal flow_run_count
             flow_run_count += 1
@@ -452,10 +469,10 @@ class TestOrchestrateFlowRun:
         assert state.result() == 1
 
         # Assert that the sleep was called
-        # due to network time and rounding, the expected sleep time will be less than
-        # 43 seconds so we test a window
+        # the delay is reported in whole seconds and, due to network time, the expected
+        # sleep time will be less than 3 seconds so we test a window
         mock_client_sleep.assert_awaited_once()
-        assert 40 < mock_client_sleep.call_args[0][0] < 43
+        assert 0 < mock_client_sleep.call_args[0][0] < 3
 
         # Check expected state transitions
         states = await orion_client.read_flow_run_states(flow_run.id)
@@ -494,15 +511,7 @@ class TestFlowRunCrashes:
 
         with self.capture_cancellation():
             async with anyio.create_task_group() as tg:
-                tg.start_soon(
-                    partial(
-                        begin_flow_run,
-                        flow=my_flow,
-                        flow_run=flow_run,
-                        parameters={},
-                        client=orion_client,
-                    )
-                )
+                tg.start_soon(begin_flow_run, my_flow, flow_run, {}, orion_client)
                 await started.wait()
                 tg.cancel_scope.cancel()
 
@@ -533,15 +542,7 @@ class TestFlowRunCrashes:
 
         with self.capture_cancellation():
             async with anyio.create_task_group() as tg:
-                tg.start_soon(
-                    partial(
-                        begin_flow_run,
-                        flow=parent_flow,
-                        parameters={},
-                        flow_run=flow_run,
-                        client=orion_client,
-                    )
-                )
+                tg.start_soon(begin_flow_run, parent_flow, flow_run, {}, orion_client)
                 await started.wait()
                 tg.cancel_scope.cancel()
 
@@ -656,17 +657,16 @@ class TestFlowRunCrashes:
         async def my_flow():
             await anyio.sleep_forever()
 
-        await begin_flow_run(
+        state = await begin_flow_run(
             flow=my_flow,
             parameters={},
             flow_run=flow_run,
             client=orion_client,
         )
-        flow_run = await orion_client.read_flow_run(flow_run.id)
 
-        assert flow_run.state.is_failed()
-        assert flow_run.state.type != StateType.CRASHED
-        assert "exceeded timeout" in flow_run.state.message
+        assert state.is_failed()
+        assert state.type != StateType.CRASHED
+        assert "exceeded timeout" in state.message
 
     async def test_timeouts_do_not_hide_crashes(self, flow_run, orion_client):
         """
@@ -683,15 +683,7 @@ class TestFlowRunCrashes:
 
         with self.capture_cancellation():
             async with anyio.create_task_group() as tg:
-                tg.start_soon(
-                    partial(
-                        begin_flow_run,
-                        parameters={},
-                        flow=my_flow,
-                        flow_run=flow_run,
-                        client=orion_client,
-                    )
-                )
+                tg.start_soon(begin_flow_run, my_flow, flow_run, {}, orion_client)
                 await started.wait()
                 tg.cancel_scope.cancel()
 
@@ -704,14 +696,17 @@ class TestFlowRunCrashes:
             in flow_run.state.message
         )
 
+    @pytest.mark.slow
     async def test_interrupt_flow(self):
-        i = 0
+        ticked = threading.Event()
 
         @flow()
         def just_sleep():
-            nonlocal i
-            for i in range(100):  # Sleep for 10 seconds
-                time.sleep(0.1)
+            # Sleep for 10 seconds in short increments; the interrupt can only be
+            # raised in the worker thread between calls to `sleep`
+            for _ in range(1000):
+                ticked.set()
+                time.sleep(0.01)
 
         @flow
         def my_flow():
@@ -726,14 +721,15 @@ class TestFlowRunCrashes:
         runtime = t1 - t0
         assert runtime < 2, "The call should be return quickly after timeout"
 
-        # Sleep for an extra second to check if the thread is still running. We cannot
-        # check `thread.is_alive()` because it is still alive — presumably this is because
-        # AnyIO is using long-lived worker threads instead of creating a new thread per
-        # task. Without a check like this, the thread can be running after timeout in the
-        # background and we will not know — the next test will start.
-        await anyio.sleep(1)
-
-        assert i <= 10, "`just_sleep` should not be running after timeout"
+        # Check that the thread is no longer running by waiting for well over one loop
+        # iteration without a tick. We cannot check `thread.is_alive()` because it is
+        # still alive — presumably this is because AnyIO is using long-lived worker
+        # threads instead of creating a new thread per task. Without a check like this,
+        # the thread can be running after timeout in the background and we will not
+        # know — the next test will start.
+        ticked.clear()
+        ticked_again = await anyio.to_thread.run_sync(ticked.wait, 0.2)
+        assert not ticked_again, "`just_sleep` should not be running after timeout"
 
 
 class TestTaskRunCrashes:
@@ -830,10 +826,9 @@ class TestTaskRunCrashes:
             flow=my_flow, flow_run=flow_run, parameters={}, client=orion_client
         )
 
-        flow_run = await orion_client.read_flow_run(flow_run.id)
-        assert flow_run.state.is_failed()
-        assert flow_run.state.name == "Failed"
-        assert "1/1 states failed" in flow_run.state.message
+        assert state.is_failed()
+        assert state.name == "Failed"
+        assert "1/1 states failed" in state.message
 
         task_run_states = state.result(raise_on_failure=False)
         assert len(task_run_states) == 1
@@ -883,12 +878,8 @@ class TestDeploymentFlowRun:
         )
 
     async def test_completed_run(self, orion_client, patch_manifest_load):
-        @flow
-        def my_flow(x: int):
-            return x
-
-        await patch_manifest_load(my_flow)
-        deployment_id = await self.create_deployment(orion_client, my_flow)
+        await patch_manifest_load(returns_x_flow)
+        deployment_id = await self.create_deployment(orion_client, returns_x_flow)
 
         flow_run = await orion_client.create_flow_run_from_deployment(
             deployment_id, parameters={"x": 1}
@@ -921,12 +912,8 @@ class TestDeploymentFlowRun:
     async def test_parameters_are_cast_to_correct_type(
         self, orion_client, patch_manifest_load
     ):
-        @flow
-        def my_flow(x: int):
-            return x
-
-        await patch_manifest_load(my_flow)
-        deployment_id = await self.create_deployment(orion_client, my_flow)
+        await patch_manifest_load(returns_x_flow)
+        deployment_id = await self.create_deployment(orion_client, returns_x_flow)
 
         flow_run = await orion_client.create_flow_run_from_deployment(
             deployment_id, parameters={"x": "1"}
@@ -940,12 +927,8 @@ class TestDeploymentFlowRun:
     async def test_state_is_failed_when_parameters_fail_validation(
         self, orion_client, patch_manifest_load
     ):
-        @flow
-        def my_flow(x: int):
-            return x
-
-        await patch_manifest_load(my_flow)
-        deployment_id = await self.create_deployment(orion_client, my_flow)
+        await patch_manifest_load(returns_x_flow)
+        deployment_id = await self.create_deployment(orion_client, returns_x_flow)
 
         flow_run = await orion_client.create_flow_run_from_deployment(
             deployment_id, parameters={"x": "not-an-int"}
@@ -961,22 +944,42 @@ class TestDeploymentFlowRun:
 
 
 class TestDynamicKeyHandling:
-    async def test_dynamic_key_increases_sequentially(self, orion_client):
+    @pytest.mark.parametrize(
+        "call_order,expected_keys",
+        [
+            # Repeated calls to the same task increment its dynamic key
+            pytest.param((0, 0, 0), [0, 1, 2], id="increases-sequentially"),
+            # Each task key has its own dynamic key counter
+            pytest.param((0, 1, 1, 0), [0, 0, 1, 1], id="unique-per-task-key"),
+        ],
+    )
+    async def test_dynamic_key_increments_per_task_key(
+        self, orion_client, call_order, expected_keys
+    ):
         @task
-        def my_task():
+        def task_one():
+            pass
+
+        @task
+        def task_two():
             pass
 
+        tasks = (task_one, task_two)
+
         @flow
         def my_flow():
-            my_task()
-            my_task()
-            my_task()
+            for index in call_order:
+                tasks[index]()
 
-        my_flow()
+        state = my_flow._run()
 
-        task_runs = await orion_client.read_task_runs()
+        task_runs = await orion_client.read_task_runs(
+            flow_run_filter=FlowRunFilter(
+                id={"any_": [state.state_details.flow_run_id]}
+            )
+        )
 
-        assert sorted([int(run.dynamic_key) for run in task_runs]) == [0, 1, 2]
+        assert sorted([int(run.dynamic_key) for run in task_runs]) == expected_keys
 
     async def test_subflow_resets_dynamic_key(self, orion_client):
         @task
@@ -996,41 +999,18 @@ class TestDynamicKeyHandling:
 
         state = my_flow._run()
 
-        task_runs = await orion_client.read_task_runs()
-        parent_task_runs = [
-            task_run
-            for task_run in task_runs
-            if task_run.flow_run_id == state.state_details.flow_run_id
-        ]
-        subflow_task_runs = [
-            task_run
-            for task_run in task_runs
-            if task_run.flow_run_id != state.state_details.flow_run_id
-        ]
+        parent_task_runs = await orion_client.read_task_runs(
+            flow_run_filter=FlowRunFilter(
+                id={"any_": [state.state_details.flow_run_id]}
+            )
+        )
+        subflow_task_runs = await orion_client.read_task_runs(
+            flow_run_filter=FlowRunFilter(
+                parent_task_run_id={"any_": [run.id for run in parent_task_runs]}
+            )
+        )
 
         assert len(parent_task_runs) == 4  # 3 standard task runs and 1 subflow
         assert len(subflow_task_runs) == 1
 
         assert int(subflow_task_runs[0].dynamic_key) == 0
-
-    async def test_dynamic_key_unique_per_task_key(self, orion_client):
-        @task
-        def task_one():
-            pass
-
-        @task
-        def task_two():
-            pass
-
-        @flow
-        def my_flow():
-            task_one()
-            task_two()
-            task_two()
-            task_one()
-
-        my_flow()
-
-        task_runs = await orion_client.read_task_runs()
-
-        assert sorted([int(run.dynamic_key) for run in task_runs]) == [0, 0, 1, 1]